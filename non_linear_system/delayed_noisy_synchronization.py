@@ -0,0 +1,166 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+# 伝送遅延τと雑音を含む結合でのローレンツシステムのカオス同期
+# chaosticSynchronizeSimulation.py の結合 k * (x1 - x2) は瞬時かつ雑音なしだが、実際の伝送路では
+#   dx2 = [f(x2) + k * (x1(t - τ) - x2(t))] dt + g(x2) dW
+# のように遅延した信号を受け取り、雑音も加わる
+# 遅延があると応答系は x1(t) ではなく x1(t - τ) に同期する(ラグ同期)ため、同期誤差は |x1(t - τ) - x2(t)| で測る
+#
+# 実装のポイント：
+# - 過去の状態は長さ O(τ/dt) の循環バッファにだけ保持し(全履歴は保存しない)、グリッド点の間はエルミート補間で求める
+#   (駆動系は滑らかなので、各点の状態と微分値を一緒に保存しておけば3次精度で補間できる)
+# - 応答系はオイラー・丸山法またはミルシュタイン法で積分する(加法的雑音ではミルシュタインの補正項は0になり両者は一致する)
+#   駆動系も同じオイラー法のドリフトで進める。駆動系だけ高次の方法で積分すると離散化の違いがそのまま同期誤差として残ってしまう
+#   ただしラグ同期の多様体 x2(t) = x1(t - τ) が離散化後も厳密に不変なのは τ/dt が整数のときだけである
+#   τ/dt が整数でない場合、エルミート補間した遅延状態はオイラー法の折れ線上にはないため、雑音がなくても
+#   O(dt) の見かけの誤差の下限が残る(k = 5, dt = 0.005 で τ = 0.0123 のとき平均誤差は約3e-4、dtを半分にするとおおよそ半分)
+#   この下限を避けたい場合は τ を dt の整数倍に選ぶ(main() の τ の格子はそうなっている)
+# - (k, τ, 雑音強度)の異なる多数の構成を配列の1軸に並べ、solve_ivpをループで呼ばずに一度に積分する
+
+# ローレンツ方程式のベクトル場(状態は形状(..., 3)の配列)
+def lorenz_field(X, sigma, rho, beta):
+    x, y, z = X[..., 0], X[..., 1], X[..., 2]
+    return np.stack([sigma * (y - x), x * (rho - z) - y, x * y - beta * z], axis=-1)
+
+# 遅延した駆動系の状態を保持する循環バッファ
+# 駆動系は全メンバーで共通なので履歴は一つだけ持ち、グリッド点 t_n の状態と微分値を保存する
+# 各メンバーの t_n - τ の値は、メンバーごとの添字で同じ履歴を読み出して3次エルミート補間で求める
+# τ/dt = m - θ (m は整数、0 <= θ < 1)と書くと、t_n - τ は t_{n-m} と t_{n-m+1} の間の割合θの位置にある
+# θ = 0 なら保存したグリッド点そのものを返す。θ > 0 では真の微分値 f(x_n) を使うため、オイラー法の折れ線からは O(dt) ずれる
+class DelayBuffer:
+    def __init__(self, tau, dt, dim=3):
+        tau = np.atleast_1d(np.asarray(tau, dtype=float))
+        if not np.all(np.isfinite(tau)) or np.any(tau < 0):
+            raise ValueError(f'tau must be finite and non-negative: {tau}')
+        self.dt = dt
+        self.lag = np.ceil(tau / dt - 1e-12).astype(int)
+        self.theta = self.lag - tau / dt
+        self.length = int(np.max(self.lag)) + 2
+        self.values = np.zeros((self.length, dim))
+        self.slopes = np.zeros((self.length, dim))
+        self.head = -1  # 最後に書き込んだ位置
+
+        # エルミート基底関数(θはメンバーごとに一定なので先に計算しておく)
+        s = self.theta[:, None]
+        self.h00 = 2 * s**3 - 3 * s**2 + 1
+        self.h10 = (s**3 - 2 * s**2 + s) * dt
+        self.h01 = -2 * s**3 + 3 * s**2
+        self.h11 = (s**3 - s**2) * dt
+
+    def push(self, value, slope):
+        self.head = (self.head + 1) % self.length
+        self.values[self.head] = value
+        self.slopes[self.head] = slope
+
+    # 最新のグリッド点から遡って τ 前の値(形状(E, dim))
+    def delayed(self):
+        i0 = (self.head - self.lag) % self.length
+        i1 = (i0 + 1) % self.length
+        return (self.h00 * self.values[i0] + self.h10 * self.slopes[i0]
+                + self.h01 * self.values[i1] + self.h11 * self.slopes[i1])
+
+# 遅延・雑音付き結合系のバッチ積分
+# k, tau, noise はスカラーまたは長さEの配列(E個の構成を同時に積分する)
+# noise_type='additive' は g = noise、'multiplicative' は g = noise * x2 (成分ごと)
+# scheme は 'euler'(オイラー・丸山法)または 'milstein'
+# 戻り値：記録時刻 t、同期誤差 |x1(t - τ) - x2(t)| の時系列(形状(E, R))、後半の時間平均 mean_error
+def simulate_delayed_sync(k, tau, noise, sigma=10.0, rho=28.0, beta=8.0 / 3.0, t_max=100.0, dt=0.005,
+                          scheme='milstein', noise_type='additive', initial_drive=[1.0, 1.0, 1.0],
+                          initial_response=[1.1, 1.1, 1.1], record_every=20, seed=None):
+    k, tau, noise = np.broadcast_arrays(np.asarray(k, dtype=float), np.asarray(tau, dtype=float),
+                                        np.asarray(noise, dtype=float))
+    k, tau, noise = k.ravel(), tau.ravel(), noise.ravel()
+    n_members = len(k)
+    if scheme not in ('euler', 'milstein'):
+        raise ValueError(f'unknown scheme: {scheme}')
+    if noise_type not in ('additive', 'multiplicative'):
+        raise ValueError(f'unknown noise_type: {noise_type}')
+    if not np.all(np.isfinite(tau)) or np.any(tau < 0):
+        raise ValueError(f'tau must be finite and non-negative: {tau}')
+
+    rng = np.random.default_rng(seed)
+    kk = k[:, None]
+    gain = noise[:, None]
+    buffer = DelayBuffer(tau, dt)
+
+    # 最大遅延の分だけ駆動系を先に積分して履歴を埋めておく(t < 0 の履歴を定数で代用しない)
+    x1 = np.array(initial_drive, dtype=float)
+    for _ in range(buffer.length):
+        slope = lorenz_field(x1, sigma, rho, beta)
+        buffer.push(x1, slope)
+        x1 = x1 + slope * dt
+    x1 = buffer.values[buffer.head].copy()
+    slope = buffer.slopes[buffer.head].copy()
+    x2 = np.broadcast_to(np.asarray(initial_response, dtype=float), (n_members, 3)).copy()
+
+    n_steps = int(round(t_max / dt))
+    n_records = n_steps // record_every + 1
+    t = np.arange(n_records) * record_every * dt
+    error = np.empty((n_members, n_records))
+    sqrt_dt = np.sqrt(dt)
+
+    for n in range(n_steps + 1):
+        x1_delayed = buffer.delayed()
+        if n % record_every == 0:
+            error[:, n // record_every] = np.linalg.norm(x1_delayed - x2, axis=1)
+        if n == n_steps:
+            break
+
+        drift = lorenz_field(x2, sigma, rho, beta) + kk * (x1_delayed - x2)
+        dW = rng.standard_normal((n_members, 3)) * sqrt_dt
+        if noise_type == 'additive':
+            x2 = x2 + drift * dt + gain * dW
+        else:
+            x2_next = x2 + drift * dt + gain * x2 * dW
+            if scheme == 'milstein':
+                # ミルシュタインの補正項 0.5 * g * g' * (dW^2 - dt)、g = noise * x2 なので g' = noise
+                x2_next += 0.5 * gain**2 * x2 * (dW**2 - dt)
+            x2 = x2_next
+
+        x1 = x1 + slope * dt
+        slope = lorenz_field(x1, sigma, rho, beta)
+        buffer.push(x1, slope)
+
+    mean_error = np.mean(error[:, n_records // 2:], axis=1)
+    return t, error, mean_error
+
+# (k, τ)の格子上で同期の頑健性を調べる：全ての組み合わせを一度にsimulate_delayed_syncに渡す
+def sync_robustness_map(k_values, tau_values, noise, **kwargs):
+    K, TAU = np.meshgrid(k_values, tau_values, indexing='ij')
+    _, _, mean_error = simulate_delayed_sync(K, TAU, noise, **kwargs)
+    return mean_error.reshape(K.shape)
+
+# メイン関数
+def main():
+    # 代表的な構成での同期誤差の時間変化
+    k_values = [5, 5, 5, 1]
+    tau_values = [0.0, 0.05, 0.05, 0.05]
+    noise_values = [0.0, 0.0, 0.5, 0.5]
+    t, error, _ = simulate_delayed_sync(k_values, tau_values, noise_values, seed=0)
+
+    fig, axs = plt.subplots(1, 3, figsize=(18, 5))
+    for i in range(len(k_values)):
+        axs[0].semilogy(t, error[i] + 1e-16, lw=0.8,
+                        label=f'k = {k_values[i]}, τ = {tau_values[i]}, noise = {noise_values[i]}')
+    axs[0].set_xlabel('Time')
+    axs[0].set_ylabel('|x1(t - τ) - x2(t)|')
+    axs[0].set_title('Lag synchronization error')
+    axs[0].legend()
+
+    # (k, τ)平面での同期誤差マップ(雑音なし／雑音あり)
+    k_grid = np.linspace(0.5, 10, 20)
+    tau_grid = np.linspace(0, 0.3, 16)
+    for ax, noise in zip(axs[1:], [0.0, 0.5]):
+        error_map = sync_robustness_map(k_grid, tau_grid, noise, t_max=50.0, seed=0)
+        mesh = ax.pcolormesh(k_grid, tau_grid, np.log10(error_map.T + 1e-16), shading='auto', cmap='viridis')
+        fig.colorbar(mesh, ax=ax, label='log10 mean error')
+        ax.set_xlabel('k')
+        ax.set_ylabel('τ')
+        ax.set_title(f'Synchronization robustness (noise = {noise})')
+
+    plt.tight_layout()
+    plt.show()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+from matplotlib.widgets import Slider
+
+# 同期させた二つのローレンツシステムをリアルタイムで表示するビューア
+# chaosticSynchronizeSimulation.py のように積分を最後まで終えてから描画するのではなく、積分器を少しずつ進めながら描画する
+# 高速化のポイント：
+# - 毎フレーム ax.plot で描き直さず、既存のLine2D/Line3Dに set_data / set_3d_properties でデータだけ差し替える
+# - blit=True で背景(軸や目盛り)をキャッシュし、変化する線だけを再描画する(軸の範囲は固定しておく)
+# - 軌跡は固定長のリングバッファに保持し、メモリ使用量と1フレームあたりの描画点数を一定に保つ
+#   描画には一定間隔で間引いたビュー(コピーなし)を使い、1フレームあたりの描画点数を max_drawn_points 以下に抑える
+# - タイマーの間隔は1msにして描画できる速さでフレームを回し、積分は経過した実時間に比例したステップ数だけ進める
+#   (TkAggなどでは前のフレームの描画が終わってからタイマーが再始動するため、間隔を16msにすると描画時間と足し合わされて約30fpsになる)
+# 結合強度kとrhoはスライダーで変更でき、次のフレームから積分に反映される(再起動は不要)
+
+# Define the Lorenz system with synchronization feedback
+def lorenz_system(t, state, sigma, rho, beta, k):
+    x1, y1, z1, x2, y2, z2 = state
+    dx1dt = sigma * (y1 - x1)
+    dy1dt = x1 * (rho - z1) - y1
+    dz1dt = x1 * y1 - beta * z1
+    dx2dt = sigma * (y2 - x2) + k * (x1 - x2)
+    dy2dt = x2 * (rho - z2) - y2 + k * (y1 - y2)
+    dz2dt = x2 * y2 - beta * z2 + k * (z1 - z2)
+    return np.array([dx1dt, dy1dt, dz1dt, dx2dt, dy2dt, dz2dt])
+
+# 4次のルンゲクッタ法で少しずつ積分し、(時刻, 状態)の配列を返すジェネレータ
+# send(n) で次に進めるステップ数を指定できる(next() のときは steps_per_chunk ステップ)
+# パラメータは毎チャンクparamsから読み直すので、途中で書き換えると次のチャンクから反映される
+def integrate_incrementally(initial_state, params, dt=0.005, steps_per_chunk=4):
+    state = np.array(initial_state, dtype=float)
+    t = 0.0
+    n_steps = steps_per_chunk
+    while True:
+        args = (params['sigma'], params['rho'], params['beta'], params['k'])
+        times = np.empty(n_steps)
+        states = np.empty((n_steps, len(state)))
+        for i in range(n_steps):
+            k1 = lorenz_system(t, state, *args)
+            k2 = lorenz_system(t + dt / 2, state + dt / 2 * k1, *args)
+            k3 = lorenz_system(t + dt / 2, state + dt / 2 * k2, *args)
+            k4 = lorenz_system(t + dt, state + dt * k3, *args)
+            state = state + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            t += dt
+            times[i] = t
+            states[i] = state
+        n_steps = (yield times, states) or steps_per_chunk
+
+# 固定長のリングバッファ
+# 同じ点を2か所(i と i + capacity)に書き込んでおくことで、古い順に並んだ直近の点列を常にコピーなしの連続したビューとして取り出せる
+class RingBuffer:
+    def __init__(self, capacity, dim):
+        self.capacity = capacity
+        self.data = np.full((2 * capacity, dim), np.nan)
+        self.head = 0  # 次に書き込む位置
+        self.size = 0
+        self.count = 0  # これまでに書き込んだ点の総数
+
+    def extend(self, points):
+        points = np.asarray(points)[-self.capacity:]
+        idx = (self.head + np.arange(len(points))) % self.capacity
+        self.data[idx] = points
+        self.data[idx + self.capacity] = points
+        self.head = (self.head + len(points)) % self.capacity
+        self.size = min(self.size + len(points), self.capacity)
+        self.count += len(points)
+
+    # 古い順に並んだ直近size個の点(形状(size, dim)のビュー)
+    def view(self):
+        end = self.head + self.capacity
+        return self.data[end - self.size:end]
+
+    # stride個おきに間引いたビュー(コピーなし)
+    # 間引く位置を書き込み総数に対して固定しておくので、点が追加されても描画される点が毎フレームずれてちらつくことはない
+    def strided(self, stride):
+        return self.view()[self.stride_offset(stride)::stride]
+
+    def stride_offset(self, stride):
+        return -(self.count - self.size) % stride
+
+# ビューアの構築
+# 左右に二つのシステムの3次元軌跡、下段に |Δ| = |x1 - x2| の時間変化(横軸は現在時刻からの相対時間)を表示する
+# steps_per_second は実時間1秒あたりに進める積分ステップ数(フレームレートが変わっても見かけの速さは変わらない)
+def build_viewer(params, initial_state=[1.0, 1.0, 1.0, 1.1, 1.1, 1.1], trail_length=10000, dt=0.005,
+                 steps_per_second=240, max_drawn_points=2500):
+    stream = integrate_incrementally(initial_state, params, dt=dt)
+    next(stream)
+    stride = max(1, -(-trail_length // max_drawn_points))
+    trail1 = RingBuffer(trail_length, 3)
+    trail2 = RingBuffer(trail_length, 3)
+    delta = RingBuffer(trail_length, 1)
+    age = (np.arange(trail_length) - trail_length + 1) * dt
+
+    fig = plt.figure(figsize=(14, 9))
+    ax1 = fig.add_axes([0.02, 0.40, 0.46, 0.58], projection='3d')
+    ax2 = fig.add_axes([0.52, 0.40, 0.46, 0.58], projection='3d')
+    ax3 = fig.add_axes([0.08, 0.16, 0.86, 0.20])
+
+    lines, heads = [], []
+    for ax, title, color in [(ax1, 'System 1 (drive)', 'tab:blue'), (ax2, 'System 2 (response)', 'tab:orange')]:
+        ax.set_xlim(-30, 30)
+        ax.set_ylim(-30, 30)
+        ax.set_zlim(0, 80)
+        ax.set_xlabel('X')
+        ax.set_ylabel('Y')
+        ax.set_zlabel('Z')
+        ax.set_title(title)
+        line, = ax.plot([], [], [], lw=0.5, color=color, animated=True)
+        head, = ax.plot([], [], [], 'o', color='black', markersize=3, animated=True)
+        lines.append(line)
+        heads.append(head)
+
+    delta_line, = ax3.semilogy([], [], lw=0.8, color='tab:red', animated=True)
+    ax3.set_xlim(age[0], 0)
+    ax3.set_ylim(1e-12, 1e2)
+    ax3.set_xlabel('t - t_now')
+    ax3.set_ylabel('|Δ|')
+    ax3.set_title('Synchronization error |x1 - x2|')
+
+    # 結合強度kとrhoのスライダー(値を変えるとparamsを書き換える)
+    k_slider = Slider(fig.add_axes([0.15, 0.07, 0.70, 0.025]), 'k', 0.0, 10.0, valinit=params['k'])
+    rho_slider = Slider(fig.add_axes([0.15, 0.03, 0.70, 0.025]), 'rho', 0.0, 50.0, valinit=params['rho'])
+    k_slider.on_changed(lambda value: params.update(k=value))
+    rho_slider.on_changed(lambda value: params.update(rho=value))
+
+    last = [time.perf_counter(), 0.0, 0.0, 0.0]  # 前フレームの時刻、fpsの移動平均、未消化のステップ数、前回fpsを表示した時刻
+
+    def update(_):
+        now = time.perf_counter()
+        elapsed = min(max(now - last[0], 0.0), 0.1)  # ウィンドウ操作などで止まっていた分は進めすぎない
+        last[1] = 0.9 * last[1] + 0.1 / max(now - last[0], 1e-6)
+        last[0] = now
+        last[2] += elapsed * steps_per_second
+        n_steps = max(1, int(last[2]))
+        last[2] -= n_steps
+
+        _, states = stream.send(n_steps)
+        trail1.extend(states[:, :3])
+        trail2.extend(states[:, 3:])
+        delta.extend(np.maximum(np.linalg.norm(states[:, :3] - states[:, 3:], axis=1), 1e-16)[:, None])
+
+        for line, head, trail in zip(lines, heads, (trail1, trail2)):
+            points = trail.strided(stride)
+            line.set_data(points[:, 0], points[:, 1])
+            line.set_3d_properties(points[:, 2])
+            newest = trail.view()[-1:]
+            head.set_data(newest[:, 0], newest[:, 1])
+            head.set_3d_properties(newest[:, 2])
+        offset = delta.stride_offset(stride)
+        delta_line.set_data(age[trail_length - delta.size:][offset::stride], delta.strided(stride)[:, 0])
+
+        # fpsは毎フレーム文字として描くと描画時間の2割近くを占めるので、0.5秒ごとにウィンドウのタイトルに表示する
+        if now - last[3] > 0.5:
+            last[3] = now
+            fig.canvas.manager.set_window_title(f'Live Lorenz synchronization   {last[1]:5.1f} fps')
+        return lines + heads + [delta_line]
+
+    anim = FuncAnimation(fig, update, interval=1, blit=True, cache_frame_data=False)
+    # スライダーはアニメーションと同じ寿命にするためアニメーションオブジェクトに持たせておく
+    anim.sliders = (k_slider, rho_slider)
+    return fig, anim
+
+# メイン関数
+def main():
+    params = {'sigma': 10.0, 'rho': 28.0, 'beta': 8.0 / 3.0, 'k': 1.0}
+    fig, anim = build_viewer(params)
+    plt.show()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,511 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.integrate import solve_ivp
+
+# 不安定周期軌道(UPO)の探索プログラム
+# カオスアトラクタは無数の不安定周期軌道を骨格として持ち、サイクル展開ではそれらの周期と安定性(フロケ乗数)からリアプノフ指数などを見積もる
+# 手順：
+# 1. ポアンカレ断面上の点列から「ほぼ元の位置に戻ってくる」区間(近再帰)を探し、周期軌道の初期候補とする
+# 2. 多重シューティング法＋減衰付きニュートン法で候補を周期軌道に収束させる(ヤコビアンは変分方程式から求める)
+# 3. 同じ周期pの候補はまとめて一つの配列に積み、線形方程式をバッチで解く(np.linalg.solveのブロードキャスト)
+# 4. 巡回シフトと記号列(シンボリックコード)で重複を除き、インデックス付きカタログに保存して再利用する
+
+# ローレンツ方程式の定義(solve_ivp用)
+def lorenz(t, state, sigma, rho, beta):
+    x, y, z = state
+    dx = sigma * (y - x)
+    dy = x * (rho - z) - y
+    dz = x * y - beta * z
+    return [dx, dy, dz]
+
+# ポアンカレ断面 z = rho - 1 (二つの不動点C±を含む平面)を下から上へ横切るイベント
+def lorenz_section(t, state, sigma, rho, beta):
+    return state[2] - (rho - 1)
+
+lorenz_section.direction = 1
+
+# ローレンツ方程式のベクトル場(状態は形状(..., 3)の配列)
+def lorenz_field(X, sigma, rho, beta):
+    x, y, z = X[..., 0], X[..., 1], X[..., 2]
+    return np.stack([sigma * (y - x), x * (rho - z) - y, x * y - beta * z], axis=-1)
+
+# ローレンツ方程式のヤコビ行列(形状(..., 3, 3))
+def lorenz_jacobian(X, sigma, rho, beta):
+    x, y, z = X[..., 0], X[..., 1], X[..., 2]
+    J = np.zeros(X.shape[:-1] + (3, 3))
+    J[..., 0, 0] = -sigma
+    J[..., 0, 1] = sigma
+    J[..., 1, 0] = rho - z
+    J[..., 1, 1] = -1.0
+    J[..., 1, 2] = -x
+    J[..., 2, 0] = y
+    J[..., 2, 1] = x
+    J[..., 2, 2] = -beta
+    return J
+
+# 4次のルンゲクッタ法による1ステップ(hは軌道ごとに異なってよい)
+def lorenz_rk4_step(X, h, sigma, rho, beta):
+    h = np.asarray(h)[..., None]
+    k1 = lorenz_field(X, sigma, rho, beta)
+    k2 = lorenz_field(X + 0.5 * h * k1, sigma, rho, beta)
+    k3 = lorenz_field(X + 0.5 * h * k2, sigma, rho, beta)
+    k4 = lorenz_field(X + h * k3, sigma, rho, beta)
+    return X + h / 6.0 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+# 多数の区間をまとめて積分し、終点と(必要なら)変分方程式の解Φ = ∂φ/∂x0 を返す
+# X0: 形状(N, 3)、h: 形状(N,)の刻み幅、n_steps: 全区間共通のステップ数
+def integrate_lorenz(X0, h, n_steps, sigma, rho, beta, variational=True):
+    X = np.array(X0, dtype=float)
+    if not variational:
+        for _ in range(n_steps):
+            X = lorenz_rk4_step(X, h, sigma, rho, beta)
+        return X, None
+
+    hh = np.asarray(h)[:, None, None]
+    hv = np.asarray(h)[:, None]
+    Phi = np.broadcast_to(np.eye(3), X.shape[:-1] + (3, 3)).copy()
+    for _ in range(n_steps):
+        k1 = lorenz_field(X, sigma, rho, beta)
+        K1 = lorenz_jacobian(X, sigma, rho, beta) @ Phi
+        X2 = X + 0.5 * hv * k1
+        k2 = lorenz_field(X2, sigma, rho, beta)
+        K2 = lorenz_jacobian(X2, sigma, rho, beta) @ (Phi + 0.5 * hh * K1)
+        X3 = X + 0.5 * hv * k2
+        k3 = lorenz_field(X3, sigma, rho, beta)
+        K3 = lorenz_jacobian(X3, sigma, rho, beta) @ (Phi + 0.5 * hh * K2)
+        X4 = X + hv * k3
+        k4 = lorenz_field(X4, sigma, rho, beta)
+        K4 = lorenz_jacobian(X4, sigma, rho, beta) @ (Phi + hh * K3)
+        X = X + hv / 6.0 * (k1 + 2 * k2 + 2 * k3 + k4)
+        Phi = Phi + hh / 6.0 * (K1 + 2 * K2 + 2 * K3 + K4)
+    return X, Phi
+
+# ヘノン写像(状態は形状(..., 2)の配列)
+def henon_step(X, a=1.4, b=0.3):
+    x, y = X[..., 0], X[..., 1]
+    return np.stack([1 - a * x**2 + y, b * x], axis=-1)
+
+# ヘノン写像のヤコビ行列(形状(..., 2, 2))
+def henon_jacobian(X, a=1.4, b=0.3):
+    J = np.zeros(X.shape[:-1] + (2, 2))
+    J[..., 0, 0] = -2 * a * X[..., 0]
+    J[..., 0, 1] = 1.0
+    J[..., 1, 0] = b
+    return J
+
+# 形状(B, n, n)の線形方程式をまとめて解く(特異な行列が混じる場合は擬似逆行列で代用)
+def batched_solve(A, rhs):
+    try:
+        return np.linalg.solve(A, rhs[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        return (np.linalg.pinv(A) @ rhs[..., None])[..., 0]
+
+# 減衰付きニュートン法(バッチ版)
+# system(z, with_jacobian) は残差F(形状(B, n))と、with_jacobian=Trueのときはヤコビ行列A(形状(B, n, n))も返す
+# 各候補ごとにステップ幅を半分にしながら残差ノルムが減少する点を探す(アルミホ条件)
+def damped_newton(system, z0, tol=1e-9, max_iter=40, max_halvings=10):
+    z = np.array(z0, dtype=float)
+    converged = np.zeros(len(z), dtype=bool)
+    failed = np.zeros(len(z), dtype=bool)
+
+    # 大きなステップで発散した試行点は残差が有限でない候補として棄却するので、オーバーフローの警告は出さない
+    with np.errstate(over='ignore', invalid='ignore'):
+        for _ in range(max_iter + 1):
+            idx = np.flatnonzero(~converged & ~failed)
+            if idx.size == 0:
+                break
+            F, A = system(z[idx], True)
+            norm = np.max(np.abs(F), axis=1)
+            converged[idx[norm < tol]] = True
+            failed[idx[~np.isfinite(norm)]] = True
+            keep = (norm >= tol) & np.isfinite(norm)
+            idx, F, A, norm = idx[keep], F[keep], A[keep], norm[keep]
+            if idx.size == 0:
+                break
+
+            delta = batched_solve(A, -F)
+            step = np.ones(len(idx))
+            pending = np.isfinite(delta).all(axis=1)
+            failed[idx[~pending]] = True
+            for _ in range(max_halvings):
+                p = np.flatnonzero(pending)
+                if p.size == 0:
+                    break
+                trial = z[idx[p]] + step[p, None] * delta[p]
+                trial_norm = np.max(np.abs(system(trial, False)), axis=1)
+                ok = trial_norm < (1 - 1e-4 * step[p]) * norm[p]
+                pending[p[ok]] = False
+                step[p[~ok]] *= 0.5
+            # 十分な減少が得られなかった候補も最小のステップ幅で更新する
+            z[idx] += step[:, None] * np.nan_to_num(delta)
+
+    return z, converged
+
+# ローレンツ系の多重シューティング残差とヤコビ行列
+# 未知数 z = (x_0, ..., x_{M-1}, T)。各区間の長さは T/M で、
+#   F_j = φ(x_j, T/M) - x_{j+1}  (x_M = x_0)
+# に加えて、軌道に沿った方向のずれを禁止する位相条件 f(x_0)・δx_0 = 0 を課す
+def lorenz_shooting_system(M, sigma, rho, beta, dt=0.005):
+    n = 3 * M + 1
+
+    def system(z, with_jacobian):
+        B = len(z)
+        points = z[:, :-1].reshape(B, M, 3)
+        T = z[:, -1]
+        n_steps = max(1, int(np.ceil(np.max(np.abs(T)) / M / dt)))
+        h = np.repeat(T / M / n_steps, M)
+        end, Phi = integrate_lorenz(points.reshape(B * M, 3), h, n_steps, sigma, rho, beta, variational=with_jacobian)
+        end = end.reshape(B, M, 3)
+        F = (end - np.roll(points, -1, axis=1)).reshape(B, 3 * M)
+        if not with_jacobian:
+            return F
+
+        Phi = Phi.reshape(B, M, 3, 3)
+        A = np.zeros((B, n, n))
+        flow_end = lorenz_field(end, sigma, rho, beta)
+        for j in range(M):
+            k = (j + 1) % M
+            A[:, 3 * j:3 * j + 3, 3 * j:3 * j + 3] += Phi[:, j]
+            A[:, 3 * j:3 * j + 3, 3 * k:3 * k + 3] -= np.eye(3)
+            A[:, 3 * j:3 * j + 3, -1] = flow_end[:, j] / M
+        A[:, -1, 0:3] = lorenz_field(points[:, 0], sigma, rho, beta)
+        return np.concatenate([F, np.zeros((B, 1))], axis=1), A
+
+    return system
+
+# ヘノン写像の多重シューティング残差とヤコビ行列
+# 未知数 z = (x_0, ..., x_{p-1})、F_j = H(x_j) - x_{j+1}  (x_p = x_0)
+def henon_shooting_system(p, a=1.4, b=0.3):
+    n = 2 * p
+
+    def system(z, with_jacobian):
+        B = len(z)
+        points = z.reshape(B, p, 2)
+        F = (henon_step(points, a, b) - np.roll(points, -1, axis=1)).reshape(B, n)
+        if not with_jacobian:
+            return F
+
+        DH = henon_jacobian(points, a, b)
+        A = np.zeros((B, n, n))
+        for j in range(p):
+            k = (j + 1) % p
+            A[:, 2 * j:2 * j + 2, 2 * j:2 * j + 2] += DH[:, j]
+            A[:, 2 * j:2 * j + 2, 2 * k:2 * k + 2] -= np.eye(2)
+        return F, A
+
+    return system
+
+# 近再帰の検出：|P[i+p] - P[i]| < eps かつ局所的に最小となる i を、近い順に最大max_seeds個返す
+def near_recurrences(P, p, eps, max_seeds):
+    if len(P) <= p + 2:
+        return np.array([], dtype=int)
+    d = np.linalg.norm(P[p:] - P[:-p], axis=1)
+    i = np.arange(1, len(d) - 1)
+    i = i[(d[i] < eps) & (d[i] <= d[i - 1]) & (d[i] <= d[i + 1])]
+    return i[np.argsort(d[i])][:max_seeds]
+
+# ローレンツ系の初期候補：長時間の軌道から断面の交点を求め、近再帰する区間上に多重シューティングの点を配置する
+# 長い周期の軌道ほど数が多い(周期12では300個以上)ので、候補の数は周期pに比例して max_seeds * p 個まで取る
+# 一本の軌道では通りにくい領域もあるため、initial_statesの各初期値から積分した軌道の候補を合わせて使う
+# 戻り値は {p: 形状(S, 3M+1)の配列}、Mは p * points_per_loop
+def lorenz_section_seeds(sigma, rho, beta, max_period=12, eps=1.5, t_max=3000.0, t_transient=50.0,
+                         points_per_loop=4, max_seeds=80, initial_states=[[1.0, 1.0, 1.0], [-1.0, -2.0, 20.0]]):
+    seeds = {}
+    for initial_state in initial_states:
+        solution = solve_ivp(lorenz, (0, t_max), initial_state, args=(sigma, rho, beta), method='DOP853',
+                             events=lorenz_section, dense_output=True, rtol=1e-10, atol=1e-10)
+        t_cross = solution.t_events[0]
+        y_cross = solution.y_events[0]
+        mask = t_cross > t_transient
+        t_cross, y_cross = t_cross[mask], y_cross[mask]
+
+        for p in range(1, max_period + 1):
+            starts = near_recurrences(y_cross[:, :2], p, eps, max_seeds * p // len(initial_states))
+            if starts.size == 0:
+                continue
+            M = p * points_per_loop
+            rows = []
+            for i in starts:
+                T = t_cross[i + p] - t_cross[i]
+                points = solution.sol(t_cross[i] + T * np.arange(M) / M).T
+                rows.append(np.concatenate([points.ravel(), [T]]))
+            seeds.setdefault(p, []).extend(rows)
+    return {p: np.array(rows) for p, rows in seeds.items()}
+
+# ヘノン写像の初期候補：アトラクタ上の点列から近再帰する区間をそのまま切り出す
+def henon_seeds(a=1.4, b=0.3, max_period=12, eps=0.05, n_points=20000, n_transient=100, max_seeds=200):
+    X = np.zeros((n_points + n_transient, 2))
+    X[0] = 0.1, 0.1
+    for i in range(1, len(X)):
+        X[i] = henon_step(X[i - 1], a, b)
+    X = X[n_transient:]
+
+    seeds = {}
+    for p in range(1, max_period + 1):
+        starts = near_recurrences(X, p, eps, max_seeds)
+        if starts.size:
+            seeds[p] = np.stack([X[i:i + p].ravel() for i in starts])
+    return seeds
+
+# 周期軌道が短い周期の軌道の繰り返しになっているかどうか(巡回シフトで自分自身と一致するか)
+def is_repeated_orbit(points, tol):
+    p = len(points)
+    for q in range(1, p):
+        if p % q == 0 and np.max(np.abs(points - np.roll(points, -q, axis=0))) < tol:
+            return True
+    return False
+
+# 巡回シフトの正規化：記号列が辞書順で最小になる回転を選ぶ(同順位なら先頭の点のx座標が小さい方)
+def canonical_shift(code, points):
+    p = len(code)
+    return min(range(p), key=lambda r: (code[r:] + code[:r], points[r, 0]))
+
+# 収束したローレンツ軌道を細かく積分し直し、断面 z = rho - 1 を上向きに横切る点と時刻を求める
+# 複数の軌道を同時に積分し(刻み幅は軌道ごとに T/n_steps)、交点は1ステップ分の刻み幅をニュートン法で調整して精密化する
+def lorenz_orbit_crossings(X0, T, sigma, rho, beta, dt=0.001):
+    X = np.array(X0, dtype=float)
+    T = np.asarray(T, dtype=float)
+    n_steps = max(1, int(np.ceil(np.max(T) / dt)))
+    h = T / n_steps
+    c = rho - 1
+    points = [[] for _ in range(len(X))]
+    times = [[] for _ in range(len(X))]
+    for i in range(n_steps):
+        X_next = lorenz_rk4_step(X, h, sigma, rho, beta)
+        hit = np.flatnonzero((X[:, 2] < c) & (X_next[:, 2] >= c))
+        if hit.size:
+            X_hit = X[hit]
+            s = h[hit] * (c - X_hit[:, 2]) / (X_next[hit, 2] - X_hit[:, 2])
+            for _ in range(3):
+                X_s = lorenz_rk4_step(X_hit, s, sigma, rho, beta)
+                s = s - (X_s[:, 2] - c) / lorenz_field(X_s, sigma, rho, beta)[:, 2]
+            for k, point, s_k in zip(hit, lorenz_rk4_step(X_hit, s, sigma, rho, beta), s):
+                points[k].append(point)
+                times[k].append(i * h[k] + s_k)
+        X = X_next
+    return [np.array(p).reshape(-1, 3) for p in points], [np.array(t) for t in times]
+
+# ローレンツ系の周期軌道探索
+# 同じ周期(断面を横切る回数)pの候補をまとめてニュートン法にかけ、収束した軌道に記号列(交点でのxの符号 L/R)を付ける
+def find_lorenz_orbits(sigma=10.0, rho=28.0, beta=8.0 / 3.0, max_period=12, seeds=None, points_per_loop=4,
+                       tol=1e-9, dedup_tol=1e-4):
+    if seeds is None:
+        seeds = lorenz_section_seeds(sigma, rho, beta, max_period=max_period, points_per_loop=points_per_loop)
+
+    orbits = []
+    for p, z0 in sorted(seeds.items()):
+        M = p * points_per_loop
+        z, converged = damped_newton(lorenz_shooting_system(M, sigma, rho, beta), z0, tol=tol)
+        z = z[converged]
+        if len(z) == 0:
+            continue
+
+        # 単周期軌道のフロケ乗数：各区間の変分行列の積(モノドロミー行列)の固有値
+        points = z[:, :-1].reshape(len(z), M, 3)
+        T = z[:, -1]
+        n_steps = max(1, int(np.ceil(np.max(T) / M / 0.005)))
+        _, Phi = integrate_lorenz(points.reshape(-1, 3), np.repeat(T / M / n_steps, M), n_steps, sigma, rho, beta)
+        Phi = Phi.reshape(len(z), M, 3, 3)
+        monodromy = Phi[:, 0]
+        for j in range(1, M):
+            monodromy = Phi[:, j] @ monodromy
+        multipliers = np.linalg.eigvals(monodromy)
+
+        # 周期が潰れた解や不動点C±へ縮退した解は除外する
+        spread = np.max(np.linalg.norm(points - points.mean(axis=1, keepdims=True), axis=2), axis=1)
+        valid = np.flatnonzero((T > 0) & (spread > 1.0))
+        if valid.size == 0:
+            continue
+        # 最初のシューティング点は断面上にあるため、そこから積分すると t = 0 と t = T の交点を二重に数えることがある
+        # 断面から半周ほど離れた点(1周あたりpoints_per_loop点あるうちの中ほど)から1周期分積分する
+        all_crossings, _ = lorenz_orbit_crossings(points[valid, points_per_loop // 2], T[valid], sigma, rho, beta)
+
+        for k, crossings in zip(valid, all_crossings):
+            if len(crossings) == 0 or is_repeated_orbit(crossings, dedup_tol * 100):
+                continue
+            code = ''.join('L' if x < 0 else 'R' for x in crossings[:, 0])
+            order = np.argsort(-np.abs(multipliers[k]))
+            # ローレンツ系は (x, y, z) -> (-x, -y, z) について対称なので、鏡像も周期と乗数が同じ周期軌道になる
+            # 記号列のLとRを入れ替えた鏡像も登録する(LRのように自分自身と一致する記号列なら同じ軌道なので追加しない)
+            mirrored_code = code.translate(str.maketrans('LR', 'RL'))
+            images = [(code, crossings)]
+            if sorted(code[r:] + code[:r] for r in range(len(code))) != \
+                    sorted(mirrored_code[r:] + mirrored_code[:r] for r in range(len(code))):
+                images.append((mirrored_code, crossings * [-1.0, -1.0, 1.0]))
+            for image_code, image_points in images:
+                r = canonical_shift(image_code, image_points)
+                orbits.append({
+                    'system': 'lorenz',
+                    'code': image_code[r:] + image_code[:r],
+                    'period': float(T[k]),
+                    'points': np.roll(image_points, -r, axis=0),
+                    'multipliers': multipliers[k][order],
+                    'params': (sigma, rho, beta),
+                })
+    return orbits
+
+# ヘノン写像の周期軌道探索
+# 記号列は各点でのxの符号(x < 0 なら0、それ以外は1)による近似的な分割で与える
+def find_henon_orbits(a=1.4, b=0.3, max_period=12, seeds=None, tol=1e-12, dedup_tol=1e-8):
+    if seeds is None:
+        seeds = henon_seeds(a, b, max_period=max_period)
+
+    orbits = []
+    for p, z0 in sorted(seeds.items()):
+        z, converged = damped_newton(henon_shooting_system(p, a, b), z0, tol=tol)
+        points = z[converged].reshape(-1, p, 2)
+        DH = henon_jacobian(points, a, b)
+        for k in range(len(points)):
+            if is_repeated_orbit(points[k], dedup_tol * 100):
+                continue
+            jacobian = np.eye(2)
+            for j in range(p):
+                jacobian = DH[k, j] @ jacobian
+            multipliers = np.linalg.eigvals(jacobian)
+            code = ''.join('0' if x < 0 else '1' for x in points[k, :, 0])
+            r = canonical_shift(code, points[k])
+            orbits.append({
+                'system': 'henon',
+                'code': code[r:] + code[:r],
+                'period': float(p),
+                'points': np.roll(points[k], -r, axis=0),
+                'multipliers': multipliers[np.argsort(-np.abs(multipliers))],
+                'params': (a, b),
+            })
+    return orbits
+
+# 周期軌道のカタログ
+# (系の名前, パラメータ, 正規化した記号列)をキーとして軌道を保持する(パラメータが異なれば同じ記号列でも別の軌道として扱う)
+# 近似的な分割では異なる軌道が同じ記号列を持つことがあるため、同じキーの中では点列と周期を比べて重複を判定する
+class OrbitCatalogue:
+    def __init__(self, tol=1e-4):
+        self.tol = tol
+        self.index = {}
+
+    def __len__(self):
+        return sum(len(orbits) for orbits in self.index.values())
+
+    def __iter__(self):
+        for key in sorted(self.index):
+            yield from self.index[key]
+
+    # パラメータは浮動小数点数のタプルに揃えてキーに使う
+    @staticmethod
+    def key(system, params, code):
+        return system, tuple(float(value) for value in params), code
+
+    # 新しい軌道なら追加してTrue、既に登録済みならFalseを返す
+    def add(self, orbit):
+        entries = self.index.setdefault(self.key(orbit['system'], orbit['params'], orbit['code']), [])
+        for other in entries:
+            if abs(other['period'] - orbit['period']) < self.tol * max(1.0, orbit['period']) and \
+                    np.max(np.abs(other['points'] - orbit['points'])) < self.tol * 100:
+                return False
+        entries.append(orbit)
+        return True
+
+    def extend(self, orbits):
+        return sum(self.add(orbit) for orbit in orbits)
+
+    def lookup(self, system, params, code):
+        return list(self.index.get(self.key(system, params, code), []))
+
+    # 登録されているパラメータの一覧
+    def parameter_sets(self, system):
+        return sorted({params for key_system, params, _ in self.index if key_system == system})
+
+    # 記号列の長さ(断面を横切る回数、あるいは写像の周期)で軌道を取り出す
+    def by_length(self, system, params, length):
+        _, params, _ = self.key(system, params, '')
+        return [orbit for (key_system, key_params, code), orbits in sorted(self.index.items())
+                if key_system == system and key_params == params and len(code) == length for orbit in orbits]
+
+    # npz形式で保存する(pickleを使わず、各軌道の配列は別々のキーに格納する)
+    def save(self, path):
+        orbits = list(self)
+        arrays = {
+            'system': np.array([orbit['system'] for orbit in orbits], dtype=str),
+            'code': np.array([orbit['code'] for orbit in orbits], dtype=str),
+            'period': np.array([orbit['period'] for orbit in orbits], dtype=float),
+            'tol': np.array(self.tol),
+        }
+        for i, orbit in enumerate(orbits):
+            arrays[f'points_{i}'] = orbit['points']
+            arrays[f'multipliers_{i}'] = orbit['multipliers']
+            arrays[f'params_{i}'] = np.array(orbit['params'], dtype=float)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            catalogue = cls(tol=float(data['tol']))
+            for i, (system, code, period) in enumerate(zip(data['system'], data['code'], data['period'])):
+                catalogue.add({
+                    'system': str(system),
+                    'code': str(code),
+                    'period': float(period),
+                    'points': data[f'points_{i}'],
+                    'multipliers': data[f'multipliers_{i}'],
+                    'params': tuple(data[f'params_{i}']),
+                })
+        return catalogue
+
+# パラメータごとに、記号列の長さごとの軌道数を表示する
+def print_summary(catalogue, system):
+    for params in catalogue.parameter_sets(system):
+        print(f'{system} {params}:')
+        lengths = sorted({len(code) for key_system, key_params, code in catalogue.index
+                          if key_system == system and key_params == params})
+        for length in lengths:
+            orbits = catalogue.by_length(system, params, length)
+            codes = ', '.join(orbit['code'] for orbit in orbits[:6])
+            print(f'  p={length:2d}: {len(orbits):3d} orbits  ({codes}{", ..." if len(orbits) > 6 else ""})')
+
+# メイン関数
+def main():
+    sigma, rho, beta = 10.0, 28.0, 8.0 / 3.0
+    catalogue = OrbitCatalogue()
+    catalogue.extend(find_henon_orbits(max_period=12))
+    # 周期12まで探索すると数分かかる(周期11, 12では既知の軌道数186, 335のうち一部は見つからないことがある)
+    catalogue.extend(find_lorenz_orbits(sigma, rho, beta, max_period=12))
+    catalogue.save('upo_catalogue.npz')
+
+    print_summary(catalogue, 'henon')
+    print_summary(catalogue, 'lorenz')
+
+    fig = plt.figure(figsize=(14, 7))
+
+    # ローレンツ系の短い周期軌道(断面交点から1周期分積分し直して描く)
+    ax1 = fig.add_subplot(121, projection='3d')
+    for orbit in catalogue:
+        if orbit['system'] == 'lorenz' and len(orbit['code']) <= 4:
+            t_eval = np.linspace(0, orbit['period'], 2000)
+            solution = solve_ivp(lorenz, (0, orbit['period']), orbit['points'][0], args=(sigma, rho, beta),
+                                 t_eval=t_eval, rtol=1e-10, atol=1e-10)
+            ax1.plot(solution.y[0], solution.y[1], solution.y[2], lw=0.8, label=orbit['code'])
+    ax1.set_xlabel('X')
+    ax1.set_ylabel('Y')
+    ax1.set_zlabel('Z')
+    ax1.set_title('Lorenz Unstable Periodic Orbits')
+    ax1.legend()
+
+    # ヘノン写像のアトラクタと周期軌道の点
+    ax2 = fig.add_subplot(122)
+    X = np.zeros((10000, 2))
+    X[0] = 0.1, 0.1
+    for i in range(1, len(X)):
+        X[i] = henon_step(X[i - 1])
+    ax2.plot(X[:, 0], X[:, 1], 'o', color='lightgray', markersize=0.5)
+    for orbit in catalogue:
+        if orbit['system'] == 'henon' and len(orbit['code']) <= 6:
+            ax2.plot(orbit['points'][:, 0], orbit['points'][:, 1], 'o', markersize=4, label=orbit['code'])
+    ax2.set_xlabel('X')
+    ax2.set_ylabel('Y')
+    ax2.set_title('Henon Map Unstable Periodic Orbits')
+    ax2.legend(fontsize=7)
+
+    plt.tight_layout()
+    plt.show()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import time
+import traceback
+import multiprocessing as mp
+import multiprocessing.connection
+from multiprocessing import shared_memory
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.integrate import solve_ivp
+
+# パラメータスイープ(chaos_lorenz.py の r_values、differentialSignalPlot.py の k_values、
+# poincareCrossSection.py の box_sizes など)を複数プロセスで並列に実行するための仕組み
+# multiprocessing.Pool で結果を返すと、形状(3, T)の solution.y のような大きな配列が毎回pickleされて親プロセスへ送られ、
+# その直列化が計算時間の大半を占めてしまう
+# ここでは：
+# - 出力配列を multiprocessing.shared_memory 上に先に確保し、各ワーカーは自分の担当インデックスの行に直接書き込む
+#   (結果の受け渡しはゼロコピーで、親プロセスのメモリには結果が1つ分しか存在しない)
+# - タスクの割り当てはワークスティーリング方式：各ワーカーは自分の範囲の先頭から取り出し、空になったら
+#   残りが最も多いワーカーの範囲の後ろ半分を奪う(計算時間がパラメータによって大きく異なっても負荷が偏らない)
+# - ワーカーが例外で落ちた場合や親プロセスで例外が起きた場合も、共有メモリのセグメントは必ず解放する
+
+# 共有メモリ上の配列の集まり
+# specs は {名前: (形状, dtype)}。with文を抜けるとセグメントを解放する(unlink)ので、配列のビューはwith文の中でだけ使い、
+# 後でも使う値はコピーしておく(解放後のビューにアクセスするとセグメンテーション違反になる)
+class SharedArrays:
+    def __init__(self, specs):
+        self.specs = {name: (tuple(np.atleast_1d(shape)), np.dtype(dtype)) for name, (shape, dtype) in specs.items()}
+        self.segments = {}
+        self.arrays = {}
+        try:
+            for name, (shape, dtype) in self.specs.items():
+                size = max(1, int(np.prod(shape)) * dtype.itemsize)
+                segment = shared_memory.SharedMemory(create=True, size=size)
+                self.segments[name] = segment
+                self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+                self.arrays[name].fill(0)
+        except BaseException:
+            self.close()
+            raise
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ワーカーに渡す情報(セグメント名と形状、dtypeだけで、データ本体は含まない)
+    def handles(self):
+        return {name: (self.segments[name].name, shape, dtype) for name, (shape, dtype) in self.specs.items()}
+
+    def close(self):
+        self.arrays.clear()  # バッファを参照するビューを先に手放す
+        for segment in self.segments.values():
+            segment.close()
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+        self.segments.clear()
+
+# ワーカー側：セグメント名から共有メモリに接続し、配列のビューを作る
+def attach_arrays(handles):
+    segments, arrays = [], {}
+    for name, (segment_name, shape, dtype) in handles.items():
+        segment = shared_memory.SharedMemory(name=segment_name)
+        segments.append(segment)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+    return segments, arrays
+
+# ワークスティーリング方式のチャンクスケジューラ
+# 各ワーカーの担当範囲 [lo, hi) を共有配列に置き、一つのロックで保護する(1タスクの計算時間に比べてロックの時間は無視できる)
+class WorkStealingScheduler:
+    def __init__(self, n_tasks, n_workers, context, chunk_size=1):
+        self.n_workers = n_workers
+        self.chunk_size = chunk_size
+        self.ranges = context.Array('q', 2 * n_workers, lock=False)
+        self.lock = context.Lock()
+        bounds = np.linspace(0, n_tasks, n_workers + 1).astype(int)
+        for w in range(n_workers):
+            self.ranges[2 * w] = bounds[w]
+            self.ranges[2 * w + 1] = bounds[w + 1]
+
+    # ワーカーwが次に処理する範囲 (lo, hi) を返す。全てのタスクが割り当て済みならNone
+    def next_chunk(self, w):
+        with self.lock:
+            lo, hi = self.ranges[2 * w], self.ranges[2 * w + 1]
+            if lo == hi:
+                remaining = [self.ranges[2 * v + 1] - self.ranges[2 * v] for v in range(self.n_workers)]
+                victim = int(np.argmax(remaining))
+                if remaining[victim] == 0:
+                    return None
+                # 残りが最も多いワーカーの範囲の後ろ半分を奪う
+                victim_hi = self.ranges[2 * victim + 1]
+                mid = victim_hi - max(1, remaining[victim] // 2)
+                self.ranges[2 * victim + 1] = mid
+                lo, hi = mid, victim_hi
+            chunk_hi = min(hi, lo + self.chunk_size)
+            self.ranges[2 * w] = chunk_hi
+            self.ranges[2 * w + 1] = hi
+            return lo, chunk_hi
+
+# ワーカープロセスの本体：kernel(i, outputs, *args) がoutputsのi番目の要素に結果を書き込む
+# 例外が起きた場合はトレースバックを自分専用のパイプで親プロセスへ送ってから終了する
+def _worker(w, kernel, handles, scheduler, args, error_conn):
+    segments, outputs = attach_arrays(handles)
+    try:
+        while (chunk := scheduler.next_chunk(w)) is not None:
+            for i in range(*chunk):
+                kernel(i, outputs, *args)
+    except BaseException:
+        error_conn.send(traceback.format_exc())
+        raise SystemExit(1)
+    finally:
+        error_conn.close()
+        outputs.clear()
+        for segment in segments:
+            segment.close()
+
+# n_tasks個のタスクを並列に実行し、結果をshared(SharedArrays)に書き込む
+# 親プロセスはワーカーの終了とエラー用パイプを同時に待つ(メッセージを読みながら待つので、大きなトレースバックでも詰まらない)
+# 最初のエラーまたは異常終了を検出した時点で残りのワーカーを停止してRuntimeErrorを送出する
+# (共有メモリの解放はSharedArraysのwith文が行う)
+def run_parallel(kernel, n_tasks, shared, args=(), n_workers=None, chunk_size=1, context=None):
+    context = context or mp.get_context()
+    n_workers = max(1, min(n_workers or mp.cpu_count(), n_tasks))
+    scheduler = WorkStealingScheduler(n_tasks, n_workers, context, chunk_size)
+    workers, readers = [], {}
+    for w in range(n_workers):
+        reader, writer = context.Pipe(duplex=False)
+        workers.append(context.Process(target=_worker, args=(w, kernel, shared.handles(), scheduler, args, writer)))
+        readers[reader] = (w, writer)
+
+    messages = []
+    try:
+        for worker, (_, writer) in zip(workers, readers.values()):
+            worker.start()
+            writer.close()  # 親プロセス側の書き込み口を閉じておくと、ワーカーの終了時にEOFが届く
+        sentinels = {worker.sentinel: w for w, worker in enumerate(workers)}
+        while (sentinels or readers) and not messages:
+            for ready in mp.connection.wait(list(sentinels) + list(readers)):
+                if ready in readers:
+                    w, _ = readers.pop(ready)
+                    try:
+                        messages.append(f'worker {w}:\n{ready.recv()}')
+                    except EOFError:
+                        pass
+                    ready.close()
+                else:
+                    w = sentinels.pop(ready)
+                    workers[w].join()
+                    if workers[w].exitcode != 0:
+                        messages.append(f'worker {w} exited with code {workers[w].exitcode}')
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            if worker.pid is not None:
+                worker.join()
+        for reader in readers:
+            reader.close()
+
+    if messages:
+        raise RuntimeError('parallel sweep failed\n' + '\n'.join(messages))
+
+# ローレンツモデルの微分方程式
+def lorenz(t, state, sigma, r, b):
+    x, y, z = state
+    dxdt = sigma * (y - x)
+    dydt = x * (r - z) - y
+    dzdt = x * y - b * z
+    return [dxdt, dydt, dzdt]
+
+# Define the Lorenz system with synchronization feedback
+def lorenz_system(t, state, sigma, rho, beta, k):
+    x1, y1, z1, x2, y2, z2 = state
+    dx1dt = sigma * (y1 - x1)
+    dy1dt = x1 * (rho - z1) - y1
+    dz1dt = x1 * y1 - beta * z1
+    dx2dt = sigma * (y2 - x2) + k * (x1 - x2)
+    dy2dt = x2 * (rho - z2) - y2 + k * (y1 - y2)
+    dz2dt = x2 * y2 - beta * z2 + k * (z1 - z2)
+    return [dx1dt, dy1dt, dz1dt, dx2dt, dy2dt, dz2dt]
+
+# フラクタル次元の計算(poincareCrossSection.py と同じ箱数え法)
+def box_counting(points, box_size):
+    min_x, max_x = np.min(points[:, 0]), np.max(points[:, 0])
+    min_y, max_y = np.min(points[:, 1]), np.max(points[:, 1])
+    bins_x = np.arange(min_x, max_x, box_size)
+    bins_y = np.arange(min_y, max_y, box_size)
+    count = 0
+
+    for bx in bins_x:
+        for by in bins_y:
+            if np.any((points[:, 0] >= bx) & (points[:, 0] < bx + box_size) & (points[:, 1] >= by) & (points[:, 1] < by + box_size)):
+                count += 1
+
+    return count
+
+# 各スイープのカーネル(ワーカーから呼ばれるのでモジュールのトップレベルに置く)
+def lorenz_r_kernel(i, outputs, r_values, sigma, b, t_eval):
+    solution = solve_ivp(lorenz, (t_eval[0], t_eval[-1]), [1.0, 1.0, 1.0], args=(sigma, r_values[i], b), t_eval=t_eval)
+    outputs['y'][i] = solution.y
+
+def sync_k_kernel(i, outputs, k_values, sigma, rho, beta, initial_conditions, t_eval):
+    solution = solve_ivp(lorenz_system, (t_eval[0], t_eval[-1]), initial_conditions, args=(sigma, rho, beta, k_values[i]),
+                         t_eval=t_eval)
+    outputs['delta'][i] = solution.y[:3] - solution.y[3:]
+
+def box_counting_kernel(i, outputs, points, box_sizes):
+    outputs['count'][i] = box_counting(points, box_sizes[i])
+
+# メイン関数
+# グラフは共有メモリ上の結果を直接参照するので、plt.show()が終わるまでセグメントを保持しておく
+def main():
+    sigma, rho, beta = 10.0, 28.0, 8.0 / 3.0
+
+    # chaos_lorenz.py の r_values のスイープ
+    r_values = np.linspace(10, 40, 16)
+    t_r = np.arange(0, 100.0, 0.01)
+
+    # differentialSignalPlot.py の k_values のスイープ
+    k_values = np.linspace(0.5, 8, 16)
+    t_k = np.linspace(0, 100, 10000)
+
+    # poincareCrossSection.py の box_sizes のスイープ
+    solution = solve_ivp(lorenz, (0, 100), [1.0, 1.0, 1.0], args=(sigma, rho, beta), t_eval=np.linspace(0, 100, 10000))
+    indices = np.where(np.abs(solution.y[2] - 27) < 0.5)[0]
+    points = np.vstack((solution.y[0][indices], solution.y[1][indices])).T
+    box_sizes = np.logspace(-2, 0, num=10)
+
+    with SharedArrays({'y': ((len(r_values), 3, len(t_r)), np.float64)}) as r_sweep, \
+            SharedArrays({'delta': ((len(k_values), 3, len(t_k)), np.float64)}) as k_sweep, \
+            SharedArrays({'count': (len(box_sizes), np.int64)}) as box_sweep:
+        start = time.perf_counter()
+        run_parallel(lorenz_r_kernel, len(r_values), r_sweep, args=(r_values, sigma, beta, t_r))
+        print(f'r sweep: {len(r_values)} runs in {time.perf_counter() - start:.2f} s')
+
+        start = time.perf_counter()
+        run_parallel(sync_k_kernel, len(k_values), k_sweep,
+                     args=(k_values, sigma, rho, beta, [1.0, 1.0, 1.0, 1.1, 1.1, 1.1], t_k))
+        print(f'k sweep: {len(k_values)} runs in {time.perf_counter() - start:.2f} s')
+
+        run_parallel(box_counting_kernel, len(box_sizes), box_sweep, args=(points, box_sizes))
+        coefficients = np.polyfit(np.log(1 / box_sizes), np.log(box_sweep['count']), 1)
+        print(f'Fractal Dimension (Lorenz): {coefficients[0]}')
+
+        fig, axs = plt.subplots(4, 4, figsize=(14, 14))
+        for ax, r, y in zip(axs.flat, r_values, r_sweep['y']):
+            ax.plot(y[0], y[2], lw=0.3)
+            ax.set_title(f'r = {r:.1f}')
+        plt.tight_layout()
+
+        plt.figure(figsize=(10, 6))
+        for k, delta in zip(k_values, k_sweep['delta']):
+            plt.semilogy(t_k, np.linalg.norm(delta, axis=0) + 1e-16, lw=0.5, label=f'k = {k:.1f}')
+        plt.xlabel('Time')
+        plt.ylabel('|Delta|')
+        plt.title('Synchronization error for each k')
+        plt.legend(fontsize=7, ncol=2)
+
+        plt.show()
+        plt.close('all')
+
+if __name__ == "__main__":
+    main()